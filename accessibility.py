@@ -0,0 +1,188 @@
+from typing import NamedTuple
+
+import numpy as np
+import streamlit as st
+
+import charting
+import colorspace
+
+# Categorical colors closer than this in OKLab are hard to tell apart at a glance.
+MIN_DISTANCE = 0.1
+# WCAG 2.1 SC 1.4.11 (non-text contrast) asks for 3:1 against adjacent colors.
+MIN_CONTRAST = 3.0
+# Resolution of the OKLab lightness search used to adapt palettes.
+LIGHTNESS_STEPS = 256
+# OKLab chroma below which a color reads as grey.
+MIN_CHROMA = 0.03
+# How much further than the nearest passing lightness an adapted color may move to stay distinct.
+MAX_EXTRA_SHIFT = 0.1
+
+
+class PairFailure(NamedTuple):
+    palette: str
+    vision: str
+    color_a: str
+    color_b: str
+    distance: float
+
+
+class ContrastFailure(NamedTuple):
+    palette: str
+    vision: str
+    color: str
+    contrast: float
+
+
+class PaletteAudit(NamedTuple):
+    pair_failures: list[PairFailure]
+    contrast_failures: list[ContrastFailure]
+
+
+class _PaletteStack(NamedTuple):
+    names: list[str]
+    colors: list[list[str]]
+    lab: np.ndarray        # (vision, palette, color, 3)
+    luminance: np.ndarray  # (vision, palette, color)
+    mask: np.ndarray       # (palette, color)
+
+
+def _stack(palettes: dict[str, list[str]]) -> _PaletteStack:
+    # All palettes padded into one array so every vision type is simulated in a single pass.
+    names = list(palettes)
+    width = max(len(colors) for colors in palettes.values())
+    rgb = np.zeros((len(names), width, 3))
+    mask = np.zeros((len(names), width), dtype=bool)
+    for i, name in enumerate(names):
+        rgb[i, :len(palettes[name])] = colorspace.hex_to_rgb(palettes[name])
+        mask[i, :len(palettes[name])] = True
+
+    linear = colorspace.simulate_cvd(rgb)
+    return _PaletteStack(
+        names=names,
+        colors=[palettes[name] for name in names],
+        lab=colorspace.linear_to_oklab(linear),
+        luminance=linear @ colorspace.LUMINANCE_WEIGHTS,
+        mask=mask,
+    )
+
+
+@st.cache_resource
+def _palette_stack() -> _PaletteStack:
+    return _stack(charting.discrete_palettes())
+
+
+def _audit(stack: _PaletteStack, background: str, min_distance: float, min_contrast: float) -> PaletteAudit:
+    # Pairwise perceptual distances, (vision, palette, color, color).
+    diff = stack.lab[:, :, :, None, :] - stack.lab[:, :, None, :, :]
+    distance = np.sqrt(np.einsum('...k,...k->...', diff, diff))
+    pair_mask = stack.mask[:, :, None] & stack.mask[:, None, :]
+    pair_mask &= np.triu(np.ones(pair_mask.shape[1:], dtype=bool), k=1)
+    failing_pairs = (distance < min_distance) & pair_mask
+    # VISIONS[0] is normal vision; CVD rows only report what normal vision doesn't already flag.
+    failing_pairs[1:] &= ~failing_pairs[0]
+
+    # Contrast of every color against the background as seen by the same vision type, (vision, palette, color).
+    background_linear = colorspace.simulate_cvd(colorspace.hex_to_rgb([background])[0])
+    background_luminance = background_linear @ colorspace.LUMINANCE_WEIGHTS
+    contrast = colorspace.luminance_contrast(stack.luminance, background_luminance[:, None, None])
+    failing_contrast = (contrast < min_contrast) & stack.mask
+    failing_contrast[1:] &= ~failing_contrast[0]
+
+    pair_failures = [
+        PairFailure(
+            palette=stack.names[p],
+            vision=colorspace.VISIONS[v],
+            color_a=stack.colors[p][a],
+            color_b=stack.colors[p][b],
+            distance=float(distance[v, p, a, b]),
+        )
+        for v, p, a, b in zip(*np.nonzero(failing_pairs))
+    ]
+    contrast_failures = [
+        ContrastFailure(
+            palette=stack.names[p],
+            vision=colorspace.VISIONS[v],
+            color=stack.colors[p][c],
+            contrast=float(contrast[v, p, c]),
+        )
+        for v, p, c in zip(*np.nonzero(failing_contrast))
+    ]
+    return PaletteAudit(pair_failures, contrast_failures)
+
+
+@st.cache_data
+def audit_palettes(background: str, min_distance: float = MIN_DISTANCE, min_contrast: float = MIN_CONTRAST) -> PaletteAudit:
+    return _audit(_palette_stack(), background, min_distance, min_contrast)
+
+
+@st.cache_data
+def audit_palette(palette: str, background: str, min_distance: float = MIN_DISTANCE, min_contrast: float = MIN_CONTRAST) -> PaletteAudit:
+    audit = audit_palettes(background, min_distance, min_contrast)
+    return PaletteAudit(
+        pair_failures=[failure for failure in audit.pair_failures if failure.palette == palette],
+        contrast_failures=[failure for failure in audit.contrast_failures if failure.palette == palette],
+    )
+
+
+@st.cache_data
+def adapt_palette(palette: str, background: str, target_contrast: float = MIN_CONTRAST, min_distance: float = MIN_DISTANCE) -> list[str]:
+    # Moves each failing color along OKLab lightness by the smallest amount that reaches the target
+    # contrast against the background. Hue is kept and chroma is only reduced where the new lightness
+    # is out of gamut; a chromatic color never lands on a step washed out to grey. Colors that already
+    # pass are kept as-is. Only where the nearest step is closer than min_distance to another color
+    # is a step up to MAX_EXTRA_SHIFT further tried, and the nearest step is kept if none is distinct.
+    colors = charting.discrete_palettes()[palette]
+    rgb = colorspace.hex_to_rgb(colors)
+    lab = colorspace.rgb_to_oklab(rgb)
+    background_luminance = colorspace.relative_luminance(colorspace.hex_to_rgb([background])[0])
+    passing = colorspace.luminance_contrast(colorspace.relative_luminance(rgb), background_luminance) >= target_contrast
+
+    # Every color against every candidate lightness at once, (color, step, 3).
+    candidates = np.repeat(lab[:, None, :], LIGHTNESS_STEPS, axis=1)
+    candidates[..., 0] = np.linspace(0, 1, LIGHTNESS_STEPS)
+    candidates = colorspace.gamut_map(candidates)
+    # Score the 8-bit colors that will actually be drawn.
+    candidate_rgb = np.rint(colorspace.oklab_to_rgb(candidates) * 255) / 255
+    candidates = colorspace.rgb_to_oklab(candidate_rgb)
+    contrast = colorspace.luminance_contrast(colorspace.relative_luminance(candidate_rgb), background_luminance)
+    shift = np.abs(candidates[..., 0] - lab[:, None, 0])
+
+    chromatic = np.hypot(lab[:, 1], lab[:, 2]) >= MIN_CHROMA
+    allowed = (np.hypot(candidates[..., 1], candidates[..., 2]) >= MIN_CHROMA) | ~chromatic[:, None]
+    allowed |= shift == shift.min(axis=1, keepdims=True)
+    reaches = allowed & (contrast >= target_contrast)
+    # The nearest step that reaches the target, or the highest allowed contrast when none does.
+    nearest = np.where(
+        reaches.any(axis=1),
+        np.where(reaches, shift, np.inf).argmin(axis=1),
+        np.where(allowed, contrast, -np.inf).argmax(axis=1),
+    )
+    steps = np.where(passing, -1, nearest)
+    adapted_lab = np.where(passing[:, None], lab, candidates[np.arange(len(colors)), nearest])
+
+    # Resolving clashes depends on where the other colors land, so it goes one clashing color at a time.
+    for i in np.flatnonzero(~passing):
+        others = np.delete(adapted_lab, i, axis=0)
+        if np.linalg.norm(others - adapted_lab[i], axis=-1).min(initial=np.inf) >= min_distance:
+            continue
+        distinct = np.linalg.norm(candidates[i, :, None, :] - others, axis=-1).min(axis=1, initial=np.inf) >= min_distance
+        options = distinct & (reaches[i] if reaches[i].any() else allowed[i])
+        options &= shift[i] <= shift[i, steps[i]] + MAX_EXTRA_SHIFT
+        if options.any():
+            steps[i] = np.where(options, shift[i], np.inf).argmin()
+            adapted_lab[i] = candidates[i, steps[i]]
+
+    adapted = colorspace.rgb_to_hex(candidate_rgb[np.arange(len(colors)), np.maximum(steps, 0)])
+    return [color if ok else new_color for color, new_color, ok in zip(colors, adapted, passing)]
+
+
+@st.cache_data
+def audit_adapted_palette(palette: str, background: str, target_contrast: float = MIN_CONTRAST, min_distance: float = MIN_DISTANCE) -> PaletteAudit:
+    # The audit of what the charts draw in adapted mode, against the adaptation's own target.
+    adapted = adapt_palette(palette, background, target_contrast, min_distance)
+    return _audit(_stack({palette: adapted}), background, min_distance, target_contrast)
+
+
+@st.cache_resource
+def adapted_template(palette: str, background: str, target_contrast: float = MIN_CONTRAST):
+    return charting.theme_template(adapt_palette(palette, background, target_contrast))
@@ -1,11 +1,12 @@
 import colorsys
+from typing import Optional
 
 import streamlit as st
 
 import fragments
+import session_memory
 import util
 from util import ThemeColor
-from charting import *
 
 st.set_page_config(
   layout="wide",
@@ -34,33 +35,64 @@ if theme_from_initial_config:
 default_color = preset_colors[0][1]
 
 
-def sync_rgb_to_hls(key: str):
-    # HLS states are necessary for the HLS sliders.
-    rgb = util.parse_hex(st.session_state[key])
-    hls = colorsys.rgb_to_hls(rgb[0], rgb[1], rgb[2])
-    st.session_state[f"{key}H"] = round(hls[0] * 360)
-    st.session_state[f"{key}L"] = round(hls[1] * 100)
-    st.session_state[f"{key}S"] = round(hls[2] * 100)
+# The editor state is the widgets' own: each color's picker holds its hex and its slider its
+# lightness, and the theme is read from the pickers on demand. Hue and saturation are derived
+# from the hex, and only stored ({key}H/{key}S) while the hex can't carry them: black, white
+# and greys have none, and 8-bit rounding moves them at low lightness.
+def color_hls(color: str) -> tuple[int, int, int]:
+    h, l, s = colorsys.rgb_to_hls(*util.parse_hex(color))
+    return round(h * 360), round(l * 100), round(s * 100)
 
 
-def sync_hls_to_rgb(key: str):
-    h = st.session_state[f"{key}H"]
-    l = st.session_state[f"{key}L"]
-    s = st.session_state[f"{key}S"]
-    r, g, b = colorsys.hls_to_rgb(h / 360, l / 100, s / 100)
-    st.session_state[key] = f"#{round(r * 255):02x}{round(g * 255):02x}{round(b * 255):02x}"
+def current_hls(key: str) -> tuple[int, int, int]:
+    h, l, s = color_hls(st.session_state[key])
+    return st.session_state.get(f"{key}H", h), l, st.session_state.get(f"{key}S", s)
+
 
+def current_theme() -> ThemeColor:
+    return ThemeColor(*(st.session_state[key] for key in ThemeColor._fields))
+
+
+def set_color(key: str, color: str, hls: Optional[tuple[int, int, int]] = None):
+    derived = color_hls(color)
+    if hls is None:
+        h, l, s = derived
+        if key in st.session_state:
+            previous_h, _, previous_s = current_hls(key)
+            if l in (0, 100):
+                # Black and white have no hue or saturation of their own.
+                h, s = previous_h, previous_s
+            elif s == 0:
+                h = previous_h
+        hls = (h, l, s)
 
-def set_color(key: str, color: str):
     st.session_state[key] = color
-    sync_rgb_to_hls(key)
+    st.session_state[f"{key}2"] = color
+    st.session_state[f"{key}L"] = hls[1]
+    for component, value, derived_value in zip("HS", hls[::2], derived[::2]):
+        if value != derived_value:
+            st.session_state[f"{key}{component}"] = value
+        else:
+            st.session_state.pop(f"{key}{component}", None)
 
 
-if 'preset_color' not in st.session_state or 'backgroundColor' not in st.session_state or 'secondaryBackgroundColor' not in st.session_state or 'textColor' not in st.session_state:
-    set_color('primaryColor', default_color.primaryColor)
-    set_color('backgroundColor', default_color.backgroundColor)
-    set_color('secondaryBackgroundColor', default_color.secondaryBackgroundColor)
-    set_color('textColor', default_color.textColor)
+def set_theme(theme: ThemeColor):
+    for key, color in zip(ThemeColor._fields, theme):
+        set_color(key, color)
+
+
+def sync_rgb_to_hls(key: str, widget_key: str):
+    set_color(key, st.session_state[widget_key])
+
+
+def sync_hls_to_rgb(key: str):
+    h, _, s = current_hls(key)
+    l = st.session_state[f"{key}L"]
+    set_color(key, util.hls_to_hex((h / 360, l / 100, s / 100)), hls=(h, l, s))
+
+
+if any(key not in st.session_state for key in ThemeColor._fields):
+    set_theme(default_color)
 
 
 st.title("Streamlit color theme editor")
@@ -68,50 +100,93 @@ st.title("Streamlit color theme editor")
 
 def on_preset_color_selected():
     _, color = preset_colors[st.session_state.preset_color]
-    set_color('primaryColor', color.primaryColor)
-    set_color('backgroundColor', color.backgroundColor)
-    set_color('secondaryBackgroundColor', color.secondaryBackgroundColor)
-    set_color('textColor', color.textColor)
+    set_theme(color)
 
 
 st.selectbox("Preset colors", key="preset_color", options=range(len(preset_colors)), format_func=lambda idx: preset_colors[idx][0], on_change=on_preset_color_selected)
 
 if st.button("🎨 Generate a random color scheme 🎲"):
     primary_color, text_color, basic_background, secondary_background = util.generate_color_scheme()
-    set_color('primaryColor', primary_color)
-    set_color('backgroundColor', basic_background)
-    set_color('secondaryBackgroundColor', secondary_background)
-    set_color('textColor', text_color)
+    set_theme(ThemeColor(
+        primaryColor=primary_color,
+        backgroundColor=basic_background,
+        secondaryBackgroundColor=secondary_background,
+        textColor=text_color,
+    ))
 
 
-def color_picker(label: str, key: str, default_color: str, l_only: bool) -> None:
+COLOR_LABELS = {
+    "primaryColor": "Primary color",
+    "backgroundColor": "Background color",
+    "secondaryBackgroundColor": "Secondary background color",
+    "textColor": "Text color",
+}
+
+
+@st.cache_resource
+def optimizer_pool():
+    # One pool per worker, shared by all sessions, so searches do not pay process start-up.
+    import optimizer
+    return optimizer.new_pool()
+
+
+def search_themes(brand: dict[str, str]) -> list[ThemeColor]:
+    import optimizer
+    from concurrent.futures.process import BrokenProcessPool
+
+    try:
+        candidates = optimizer.optimize_theme(brand, time_budget=3.0, executor=optimizer_pool())
+    except BrokenProcessPool:
+        # A crashed worker breaks the shared pool for every session, so start a fresh one.
+        optimizer_pool.clear()
+        candidates = optimizer.optimize_theme(brand, time_budget=3.0, executor=optimizer_pool())
+    return [candidate.theme for candidate in optimizer.spread(candidates, 5)]
+
+
+with st.expander("🧬 Search compliant color schemes"):
+    pinned = st.multiselect(
+        "Keep close to the current",
+        options=list(COLOR_LABELS),
+        default=["primaryColor"],
+        format_func=COLOR_LABELS.get,
+    )
+    if st.button("Search for 3 seconds"):
+        theme = current_theme()
+        brand = {field: getattr(theme, field) for field in pinned}
+        with st.spinner("Searching..."):
+            st.session_state.optimized_themes = search_themes(brand)
+
+    for i, theme in enumerate(st.session_state.get("optimized_themes", [])):
+        st.markdown(" ".join(
+            f'<span style="background-color: {color}; padding: 4px 12px; border: 1px solid grey">&nbsp;</span> `{color}`'
+            for color in theme
+        ), unsafe_allow_html=True)
+        st.button("Use this scheme", key=f"optimized_theme:{i}", on_click=set_theme, args=(theme,))
+
+
+def color_picker(label: str, key: str, l_only: bool) -> str:
     col1, col2 = st.columns([1, 3])
     with col1:
-        color = st.color_picker(label, key=key, on_change=sync_rgb_to_hls, kwargs={"key": key})
+        st.color_picker(label, key=key, on_change=sync_rgb_to_hls, kwargs={"key": key, "widget_key": key})
     with col2:
-        r,g,b = util.parse_hex(default_color)
-        h,l,s = colorsys.rgb_to_hls(r,g,b)
-        if l_only:
-            if f"{key}H" not in st.session_state:
-                st.session_state[f"{key}H"] = round(h * 360)
-        else:
-            st.slider(f"H for {label}", key=f"{key}H", min_value=0, max_value=360, value=round(h * 360), format="%d°", label_visibility="collapsed", on_change=sync_hls_to_rgb, kwargs={"key": key})
+        h, _, s = current_hls(key)
+        if not l_only:
+            st.session_state.setdefault(f"{key}H", h)
+            st.slider(f"H for {label}", key=f"{key}H", min_value=0, max_value=360, format="%d°", label_visibility="collapsed", on_change=sync_hls_to_rgb, kwargs={"key": key})
 
-        st.slider(f"L for {label}", key=f"{key}L", min_value=0, max_value=100, value=round(l * 100), format="%d%%", label_visibility="collapsed", on_change=sync_hls_to_rgb, kwargs={"key": key})
+        st.slider(f"L for {label}", key=f"{key}L", min_value=0, max_value=100, format="%d%%", label_visibility="collapsed", on_change=sync_hls_to_rgb, kwargs={"key": key})
 
-        if l_only:
-            if f"{key}S" not in st.session_state:
-                st.session_state[f"{key}S"] = round(s * 100)
-        else:
-            st.slider(f"S for {label}", key=f"{key}S", min_value=0, max_value=100, value=round(s * 100), format="%d%%", label_visibility="collapsed", on_change=sync_hls_to_rgb, kwargs={"key": key})
+        if not l_only:
+            st.session_state.setdefault(f"{key}S", s)
+            st.slider(f"S for {label}", key=f"{key}S", min_value=0, max_value=100, format="%d%%", label_visibility="collapsed", on_change=sync_hls_to_rgb, kwargs={"key": key})
 
-    return color
+    return st.session_state[key]
 
 
-primary_color = color_picker('Primary color', key="primaryColor", default_color=default_color.primaryColor, l_only=True)
-text_color = color_picker('Text color', key="textColor", default_color=default_color.textColor, l_only=True)
-background_color = color_picker('Background color', key="backgroundColor", default_color=default_color.backgroundColor, l_only=True)
-secondary_background_color = color_picker('Secondary background color', key="secondaryBackgroundColor", default_color=default_color.secondaryBackgroundColor, l_only=True)
+primary_color = color_picker('Primary color', key="primaryColor", l_only=True)
+text_color = color_picker('Text color', key="textColor", l_only=True)
+background_color = color_picker('Background color', key="backgroundColor", l_only=True)
+secondary_background_color = color_picker('Secondary background color', key="secondaryBackgroundColor", l_only=True)
 
 
 st.header("WCAG contrast ratio")
@@ -119,21 +194,18 @@ st.markdown("""
 Check if the color contrasts of the selected colors are enough to the WCAG guidelines recommendation.
 For the details about it, see some resources such as the [WCAG document](https://www.w3.org/WAI/WCAG21/Understanding/contrast-minimum.html) or the [MDN page](https://developer.mozilla.org/en-US/docs/Web/Accessibility/Understanding_WCAG/Perceivable/Color_contrast).""")
 
-def synced_color_picker(label: str, value: str, key: str):
-    def on_change():
-        st.session_state[key] = st.session_state[key + "2"]
-        sync_rgb_to_hls(key)
-    st.color_picker(label, value=value, key=key + "2", on_change=on_change)
+def synced_color_picker(label: str, key: str):
+    st.color_picker(label, key=f"{key}2", on_change=sync_rgb_to_hls, kwargs={"key": key, "widget_key": f"{key}2"})
 
 col1, col2, col3 = st.columns(3)
 with col2:
-    synced_color_picker("Background color", value=background_color, key="backgroundColor")
+    synced_color_picker("Background color", key="backgroundColor")
 with col3:
-    synced_color_picker("Secondary background color", value=secondary_background_color, key="secondaryBackgroundColor")
+    synced_color_picker("Secondary background color", key="secondaryBackgroundColor")
 
 col1, col2, col3 = st.columns(3)
 with col1:
-    synced_color_picker("Primary color", value=primary_color, key="primaryColor")
+    synced_color_picker("Primary color", key="primaryColor")
 with col2:
     fragments.contrast_summary("Primary/Background", primary_color, background_color)
 with col3:
@@ -141,7 +213,7 @@ with col3:
 
 col1, col2, col3 = st.columns(3)
 with col1:
-    synced_color_picker("Text color", value=text_color, key="textColor")
+    synced_color_picker("Text color", key="textColor")
 with col2:
     fragments.contrast_summary("Text/Background", text_color, background_color)
 with col3:
@@ -192,9 +264,10 @@ if st.checkbox("Apply theme to this page"):
 #--------
 # Custom
 #----------
-import pandas as pd
-import numpy as np
-import random
+# The charting stack (plotly, pandas, numpy, PIL) is only imported from here on,
+# so everything above is already rendered while it loads on a cold start.
+import accessibility
+import charting
 
 # def generate_toy_df():
 #     def generate_data(n, scope, start_year, end_year, category=None, emissions=1):
@@ -219,7 +292,14 @@ import random
 #     df['emissions'] = df['emissions'] * random.randint(1000, 50000)
 #     return df
 
+# Shared by every session instead of being regenerated on each rerun.
+@st.cache_resource
 def create_line_simulation():
+    import random
+
+    import numpy as np
+    import pandas as pd
+
     def random_timeseries(initial_value: float, volatility: float, count: int, trend: float = 0.0) -> list:
         time_series = [initial_value]
         for _ in range(count - 1):
@@ -249,21 +329,29 @@ with st.sidebar:
     chart_options = ['gecko3', 'gecko5', 'gecko7', 'gecko_v1', 'ilo', 'tableau', 'google']
     
     chart_theme = st.selectbox('Select theme', options=chart_options)
+    adapt_chart_colors = st.checkbox('Adapt chart colors to the background', value=False)
 
-initialize_plotly_themes()
+    with st.expander("Palette accessibility"):
+        fragments.palette_audit_summary(chart_theme, background_color, adapted=adapt_chart_colors)
+
+charting.initialize_plotly_themes()
+if adapt_chart_colors:
+    chart_template = accessibility.adapted_template(chart_theme, background_color)
+else:
+    chart_template = chart_theme
 ts= create_line_simulation()
 # df = create_toy_df()
 
 st.write(ts)
 
-fig1 = make_grouped_line_chart(
+fig1 = charting.make_grouped_line_chart(
     ts, 
     group_col='category', 
     value_col='value', 
     date_col='date', 
     resample_freq='Q', 
     stacked=False,
-    theme=chart_theme
+    theme=chart_template
 )
 st.plotly_chart(fig1, use_container_width=True)
 
@@ -272,3 +360,5 @@ st.plotly_chart(fig1, use_container_width=True)
 # fig2 = make_donut_chart(
 #     df, group_col='category', value_col='financed_emissions', center_text='Pie chart',
 # )
+
+session_memory.log_session_state_bytes()
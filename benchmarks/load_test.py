@@ -0,0 +1,181 @@
+"""Headless multi-session load test for app.py.
+
+Runs N simulated editor sessions concurrently inside one process, the way a single
+Streamlit worker would host them, using the in-process script runner from
+`streamlit.testing`. Each session replays a random mix of slider drags, preset
+switches, random-scheme clicks and chart-theme switches, and every rerun is timed.
+A slider drag replays DRAG_STEPS intermediate values, each one its own rerun, as the
+browser sends them while the handle moves.
+
+    python benchmarks/load_test.py --sessions 20 --interactions 30
+
+CPU and RSS are measured for the whole process and divided by the number of sessions;
+install psutil for current RSS, otherwise the peak RSS from `resource` is used.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple
+
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import session_memory  # noqa: E402
+
+APP_PATH = str(REPO_ROOT / "app.py")
+
+COLOR_LABELS = ["Primary color", "Text color", "Background color", "Secondary background color"]
+CHART_THEMES = ['gecko3', 'gecko5', 'gecko7', 'gecko_v1', 'ilo', 'tableau', 'google']
+RANDOM_SCHEME_LABEL = "🎨 Generate a random color scheme 🎲"
+# Values a slider drag sends on its way to where it is released.
+DRAG_STEPS = 5
+
+
+class Rerun(NamedTuple):
+    session: int
+    action: str
+    seconds: float
+    state_bytes: int
+
+
+def rss_bytes() -> int:
+    try:
+        import psutil
+    except ImportError:
+        import resource
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return psutil.Process().memory_info().rss
+
+
+def _by_label(elements, label: str):
+    return next(element for element in elements if element.label == label)
+
+
+def drag_slider(at: AppTest, rng: random.Random) -> Iterator[AppTest]:
+    label = f"L for {rng.choice(COLOR_LABELS)}"
+    start = _by_label(at.slider, label).value
+    end = rng.randint(0, 100)
+    values = [round(start + (end - start) * step / DRAG_STEPS) for step in range(1, DRAG_STEPS + 1)]
+    for value in dict.fromkeys(values):
+        yield _by_label(at.slider, label).set_value(value)
+
+
+def switch_preset(at: AppTest, rng: random.Random) -> Iterator[AppTest]:
+    preset = _by_label(at.selectbox, "Preset colors")
+    yield preset.set_value(rng.randrange(len(preset.options)))
+
+
+def click_random_scheme(at: AppTest, rng: random.Random) -> Iterator[AppTest]:
+    yield _by_label(at.button, RANDOM_SCHEME_LABEL).click()
+
+
+def switch_chart_theme(at: AppTest, rng: random.Random) -> Iterator[AppTest]:
+    yield _by_label(at.sidebar.selectbox, "Select theme").set_value(rng.choice(CHART_THEMES))
+
+
+# Each action yields the widget changes it sends; every one of them is a rerun.
+ACTIONS: dict[str, Callable[[AppTest, random.Random], Iterator[AppTest]]] = {
+    "slider": drag_slider,
+    "preset": switch_preset,
+    "random_scheme": click_random_scheme,
+    "chart_theme": switch_chart_theme,
+}
+# Slider drags dominate real traffic.
+ACTION_WEIGHTS = {"slider": 6, "preset": 1, "random_scheme": 2, "chart_theme": 1}
+
+
+def _state_bytes(at: AppTest) -> int:
+    return sum(session_memory.session_state_bytes(at.session_state.to_dict()).values())
+
+
+def run_session(session: int, interactions: int, think_time: float, timeout: float, seed: int, start: threading.Barrier) -> list[Rerun]:
+    rng = random.Random(seed + session)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    reruns = []
+
+    start.wait()
+    begin = time.perf_counter()
+    at.run()
+    reruns.append(Rerun(session, "initial", time.perf_counter() - begin, _state_bytes(at)))
+
+    for _ in range(interactions):
+        if think_time:
+            time.sleep(rng.uniform(0, 2 * think_time))
+        action = rng.choices(list(ACTION_WEIGHTS), weights=list(ACTION_WEIGHTS.values()))[0]
+        for change in ACTIONS[action](at, rng):
+            begin = time.perf_counter()
+            change.run()
+            reruns.append(Rerun(session, action, time.perf_counter() - begin, _state_bytes(at)))
+            if at.exception:
+                raise RuntimeError(f"session {session} failed after {action}: {at.exception[0].message}")
+    return reruns
+
+
+def percentiles(seconds: list[float]) -> str:
+    if len(seconds) < 2:
+        return f"p50 {1000 * seconds[0]:7.1f} ms"
+    cuts = statistics.quantiles(seconds, n=100, method="inclusive")
+    return f"p50 {1000 * cuts[49]:7.1f} ms  p95 {1000 * cuts[94]:7.1f} ms  p99 {1000 * cuts[98]:7.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent simulated sessions")
+    parser.add_argument("--interactions", type=int, default=20, help="scripted interactions per session")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean pause between interactions, in seconds")
+    parser.add_argument("--timeout", type=float, default=120.0, help="timeout of a single rerun, in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # app.py resolves resources relative to the working directory.
+    os.chdir(REPO_ROOT)
+
+    # Warm up imports and process-wide caches so the baseline only excludes per-session cost.
+    AppTest.from_file(APP_PATH, default_timeout=args.timeout).run()
+    baseline_rss = rss_bytes()
+    baseline_cpu = time.process_time()
+
+    start = threading.Barrier(args.sessions)
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        futures = [
+            pool.submit(run_session, session, args.interactions, args.think_time, args.timeout, args.seed, start)
+            for session in range(args.sessions)
+        ]
+        reruns = [rerun for future in futures for rerun in future.result()]
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - baseline_cpu
+    rss = rss_bytes()
+
+    print(f"{args.sessions} sessions x {args.interactions} interactions, {len(reruns)} reruns in {wall:.1f} s "
+          f"({len(reruns) / wall:.1f} reruns/s)")
+    print("\nRerun latency")
+    print(f"  {'all':<14} n={len(reruns):<5} {percentiles([rerun.seconds for rerun in reruns])}")
+    for action in ["initial", *ACTIONS]:
+        seconds = [rerun.seconds for rerun in reruns if rerun.action == action]
+        if seconds:
+            print(f"  {action:<14} n={len(seconds):<5} {percentiles(seconds)}")
+
+    print("\nResources")
+    print(f"  CPU total           {cpu:8.2f} s  ({100 * cpu / wall:.0f}% of one core)")
+    print(f"  CPU per session     {cpu / args.sessions:8.2f} s")
+    print(f"  CPU per rerun       {1000 * cpu / len(reruns):8.1f} ms")
+    print(f"  RSS                 {rss / 2**20:8.1f} MiB  (baseline {baseline_rss / 2**20:.1f} MiB)")
+    print(f"  RSS per session     {(rss - baseline_rss) / args.sessions / 2**20:8.2f} MiB")
+    state_bytes = [rerun.state_bytes for rerun in reruns]
+    print(f"  Session state       {statistics.mean(state_bytes) / 1024:8.1f} KiB per session on average, "
+          f"{max(state_bytes) / 1024:.1f} KiB max")
+
+
+if __name__ == "__main__":
+    main()
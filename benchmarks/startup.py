@@ -0,0 +1,108 @@
+"""Cold-start benchmark for the theme editor.
+
+Every measurement runs in a fresh interpreter so module caches never leak between runs.
+
+    python benchmarks/startup.py [--repeat 5] [--top 15]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# What a cold worker imports before the first widget can be sent.
+STARTUP_IMPORTS = "import streamlit, fragments, util"
+
+FIRST_RENDER_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file("app.py", default_timeout=120).run()
+done = time.perf_counter()
+print(json.dumps({"import": imported - start, "render": done - imported, "errors": len(at.exception)}))
+"""
+
+CHART_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import charting
+imported = time.perf_counter()
+import pandas as pd
+df = pd.DataFrame({
+    "date": pd.date_range("2019-01-01", periods=36, freq="MS").repeat(12),
+    "category": [f"Category_{i + 1}" for i in range(12)] * 36,
+    "value": range(36 * 12),
+})
+data_ready = time.perf_counter()
+charting.initialize_plotly_themes()
+fig = charting.make_grouped_line_chart(df, group_col="category", value_col="value", date_col="date", theme="gecko5")
+fig.to_json()
+done = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_chart": done - data_ready}))
+"""
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+
+
+def import_profile(statement: str) -> dict[str, int]:
+    # Self time in microseconds per top-level package, from `python -X importtime`.
+    result = run_python("-X", "importtime", "-c", statement)
+    self_times: dict[str, int] = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        self_times[name.strip().split(".")[0]] += int(self_us)
+    return self_times
+
+
+def report_import_profile(statement: str, top: int) -> None:
+    profile = import_profile(statement)
+    total = sum(profile.values())
+    print(f"\n`{statement}`: {total / 1000:.1f} ms")
+    for package, us in sorted(profile.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {package:<24} {us / 1000:8.1f} ms  {100 * us / total:5.1f}%")
+
+
+def timed_runs(script: str, repeat: int) -> dict[str, float]:
+    runs = [json.loads(run_python("-c", script).stdout.strip().splitlines()[-1]) for _ in range(repeat)]
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per timing (median is reported)")
+    parser.add_argument("--top", type=int, default=15, help="packages listed per import profile")
+    args = parser.parse_args()
+
+    print("Import time by top-level package (self time, share of total)")
+    report_import_profile(STARTUP_IMPORTS, args.top)
+    report_import_profile("import charting", args.top)
+    report_import_profile("import charting; charting.initialize_plotly_themes(); charting.gecko_logo()", args.top)
+
+    chart = timed_runs(CHART_SCRIPT, args.repeat)
+    print(f"\nFirst chart (median of {args.repeat})")
+    print(f"  import charting           {1000 * chart['import']:8.1f} ms")
+    print(f"  themes + figure + JSON    {1000 * chart['first_chart']:8.1f} ms")
+
+    try:
+        render = timed_runs(FIRST_RENDER_SCRIPT, args.repeat)
+    except subprocess.CalledProcessError as e:
+        print(f"\nFirst render skipped, streamlit.testing is unavailable:\n{e.stderr.strip().splitlines()[-1]}")
+        return
+    print(f"\nFirst full script run of app.py (median of {args.repeat})")
+    print(f"  import streamlit.testing  {1000 * render['import']:8.1f} ms")
+    print(f"  first render              {1000 * render['render']:8.1f} ms")
+    if render["errors"]:
+        print(f"  warning: the script raised {render['errors']} exception(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,15 @@
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.io as pio
-
-import numpy as np
-import pandas as pd
+# plotly, pandas and PIL are imported inside the functions that need them so that
+# importing this module (e.g. for ColorDiscrete) stays cheap on a cold start.
+from __future__ import annotations
 
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from typing import Union
 from typing import Optional
-from PIL import Image
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import plotly.graph_objects as go
 
 #---
 # chart config
@@ -42,12 +43,27 @@ class ColorDiscrete:
     '#d5a6bd',
     # '
   ]
-    
-GECKO_LOGO = Image.open("./resources/BlackShortText_Logo_Horizontal-long.png")
+
+
+def discrete_palettes() -> dict[str, list[str]]:
+    return {name: colors for name, colors in vars(ColorDiscrete).items() if isinstance(colors, list)}
+
+@lru_cache(maxsize=None)
+def gecko_logo():
+    from PIL import Image
+    return Image.open("./resources/BlackShortText_Logo_Horizontal-long.png")
+
+
+def __getattr__(name):
+    # Keeps `charting.GECKO_LOGO` working while loading the image on first access.
+    if name == "GECKO_LOGO":
+        return gecko_logo()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def watermark_settings():
     return [dict(
-        source= GECKO_LOGO,
+        source= gecko_logo(),
         xref="paper", yref="paper",
         x=0.98, y=0.02,
         sizex=0.20, sizey=0.20, opacity= 0.25,
@@ -78,81 +94,34 @@ def legend_settings_dark(orientation='v', max_per_row=7):
 #---
 # Theme config
 #---
-def initialize_plotly_themes():
-    pio.templates["gecko_v1"] = go.layout.Template(
-        layout={
-            'colorway': ColorDiscrete.gecko_v1,
-            'plot_bgcolor': 'rgba(0,0,0,0)',
-            'paper_bgcolor': 'rgba(0,0,0,0)',
-            'xaxis': {'gridcolor': 'grey'},
-            'yaxis': {'gridcolor': 'grey'},
-        }
-    )
+def theme_template(colorway: list[str]) -> go.layout.Template:
+    import plotly.graph_objects as go
 
-    pio.templates["gecko7"] = go.layout.Template(
-        layout={
-            'colorway': ColorDiscrete.gecko7,
-            'plot_bgcolor': 'rgba(0,0,0,0)',
-            'paper_bgcolor': 'rgba(0,0,0,0)',
-            'xaxis': {'gridcolor': 'grey'},
-            'yaxis': {'gridcolor': 'grey'},
-        }
-    )
+    import colorscales
+
+    layout = {
+        'colorway': colorway,
+        'plot_bgcolor': 'rgba(0,0,0,0)',
+        'paper_bgcolor': 'rgba(0,0,0,0)',
+        'xaxis': {'gridcolor': 'grey'},
+        'yaxis': {'gridcolor': 'grey'},
+    }
+    # Categorical palettes jump around in lightness, so their scale uses the colors ordered dark to light.
+    layout['colorscale'] = {'sequential': colorscales.plotly_colorscale(colorscales.sequential_colors(colorway))}
+    return go.layout.Template(layout=layout)
 
-    pio.templates["gecko5"] = go.layout.Template(
-        layout={
-            'colorway': ColorDiscrete.gecko5,
-            'plot_bgcolor': 'rgba(0,0,0,0)',
-            'paper_bgcolor': 'rgba(0,0,0,0)',
-            'xaxis': {'gridcolor': 'grey'},
-            'yaxis': {'gridcolor': 'grey'},
-        }
-    )
-    pio.templates["gecko3"] = go.layout.Template(
-        layout={
-            'colorway': ColorDiscrete.gecko3,
-            'plot_bgcolor': 'rgba(0,0,0,0)',
-            'paper_bgcolor': 'rgba(0,0,0,0)',
-            'xaxis': {'gridcolor': 'grey'},
-            'yaxis': {'gridcolor': 'grey'},
-        }
-    )
-    pio.templates["tableau"] = go.layout.Template(
-        layout={
-            'colorway': ColorDiscrete.tableau,
-            'plot_bgcolor': 'rgba(0,0,0,0)',
-            'paper_bgcolor': 'rgba(0,0,0,0)',
-            'xaxis': {'gridcolor': 'grey'},
-            'yaxis': {'gridcolor': 'grey'},
-        }
-    )
-    pio.templates["ilo"] = go.layout.Template(
-        layout={
-            'colorway': ColorDiscrete.ilo,
-            'plot_bgcolor': 'rgba(0,0,0,0)',
-            'paper_bgcolor': 'rgba(0,0,0,0)',
-            'xaxis': {'gridcolor': 'grey'},
-            'yaxis': {'gridcolor': 'grey'},
-        }
-    )
-    pio.templates["d3"] = go.layout.Template(
-        layout={
-            'colorway': ColorDiscrete.d3,
-            'plot_bgcolor': 'rgba(0,0,0,0)',
-            'paper_bgcolor': 'rgba(0,0,0,0)',
-            'xaxis': {'gridcolor': 'grey'},
-            'yaxis': {'gridcolor': 'grey'},
-        }
-    )
-    pio.templates["google"] = go.layout.Template(
-        layout={
-            'colorway': ColorDiscrete.google,
-            'plot_bgcolor': 'rgba(0,0,0,0)',
-            'paper_bgcolor': 'rgba(0,0,0,0)',
-            'xaxis': {'gridcolor': 'grey'},
-            'yaxis': {'gridcolor': 'grey'},
-        }
-    )
+
+def initialize_plotly_themes():
+    import plotly.io as pio
+
+    pio.templates["gecko_v1"] = theme_template(ColorDiscrete.gecko_v1)
+    pio.templates["gecko7"] = theme_template(ColorDiscrete.gecko7)
+    pio.templates["gecko5"] = theme_template(ColorDiscrete.gecko5)
+    pio.templates["gecko3"] = theme_template(ColorDiscrete.gecko3)
+    pio.templates["tableau"] = theme_template(ColorDiscrete.tableau)
+    pio.templates["ilo"] = theme_template(ColorDiscrete.ilo)
+    pio.templates["d3"] = theme_template(ColorDiscrete.d3)
+    pio.templates["google"] = theme_template(ColorDiscrete.google)
 
 #---
 # Charting
@@ -173,6 +142,9 @@ def make_bar_chart(
     legend: bool = True,
     legend_dark: bool= False
 ):
+    import pandas as pd
+    import plotly.graph_objects as go
+
     # Initialize figure
     fig = go.Figure()
     
@@ -253,6 +225,8 @@ def make_donut_chart(
     legend=True,
     legend_dark=False
 ):
+    import plotly.graph_objects as go
+
     # Group the data
     grouped_data = df.groupby(group_col).agg({value_col: 'sum'}).reset_index()
     sorted_labels = df[group_col].unique()
@@ -314,6 +288,11 @@ def make_grouped_line_chart(
     height=None, 
     width=None
 ):
+    import pandas as pd
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    from plotly.subplots import make_subplots
+
     # Filter and aggregate data
     temp = df.copy()
     
@@ -335,7 +314,9 @@ def make_grouped_line_chart(
 
     # Initialize color map
     unique_categories = temp[group_col].unique()
-    if theme and theme in pio.templates:
+    if isinstance(theme, go.layout.Template):
+        colors = theme.layout.colorway
+    elif theme and theme in pio.templates:
         colors = pio.templates[theme].layout.colorway  # Retrieve color sequence from theme
     else:
         colors = pio.templates['streamlit'].layout.colorway  # Fallback to default colors
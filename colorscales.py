@@ -0,0 +1,117 @@
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+import charting
+import colorspace
+
+LUT_SIZE = 256
+PLOTLY_STOPS = 11
+# Drawn for NaN values so missing data can't be mistaken for the low end of the scale.
+NAN_COLOR = "#808080"
+# Palette colors closer than this in OKLab lightness add no order to a sequential scale.
+MIN_LIGHTNESS_STEP = 0.02
+
+
+def is_sequential(colors: Sequence[str]) -> bool:
+    return _is_sequential(tuple(colors))
+
+
+@lru_cache(maxsize=None)
+def _is_sequential(colors: tuple[str, ...]) -> bool:
+    # Only palettes whose OKLab lightness strictly rises or falls read as an ordered scale.
+    lightness = np.diff(colorspace.rgb_to_oklab(colorspace.hex_to_rgb(colors))[:, 0])
+    return len(colors) > 1 and bool((lightness > 0).all() or (lightness < 0).all())
+
+
+def sequential_colors(colors: Sequence[str]) -> tuple[str, ...]:
+    return _sequential_colors(tuple(colors))
+
+
+@lru_cache(maxsize=None)
+def _sequential_colors(colors: tuple[str, ...]) -> tuple[str, ...]:
+    # Sequential palettes as they are; categorical ones ordered dark to light, skipping colors that
+    # don't step up in lightness, so every palette gives a scale that reads as ordered.
+    if len(colors) < 2 or _is_sequential(colors):
+        return colors
+    lightness = colorspace.rgb_to_oklab(colorspace.hex_to_rgb(colors))[:, 0]
+    kept = []
+    for i in np.argsort(lightness, kind="stable"):
+        if not kept or lightness[i] - lightness[kept[-1]] >= MIN_LIGHTNESS_STEP:
+            kept.append(i)
+    return tuple(colors[i] for i in kept)
+
+
+def lookup_table(colors: Sequence[str], size: int = LUT_SIZE) -> np.ndarray:
+    # Evenly spaced colors interpolated in OKLab, returned as a read-only (size, 3) uint8 sRGB array.
+    return _lookup_table(tuple(colors), size)
+
+
+@lru_cache(maxsize=None)
+def _lookup_table(colors: tuple[str, ...], size: int) -> np.ndarray:
+    lab = colorspace.rgb_to_oklab(colorspace.hex_to_rgb(colors))
+    if len(colors) == 1:
+        lab = np.repeat(lab, 2, axis=0)
+    stops = np.linspace(0, 1, len(lab))
+    positions = np.linspace(0, 1, size)
+    interpolated = np.stack([np.interp(positions, stops, lab[:, channel]) for channel in range(3)], axis=-1)
+    table = np.rint(colorspace.oklab_to_rgb(interpolated) * 255).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=None)
+def _hex_lookup_table(colors: tuple[str, ...], size: int) -> np.ndarray:
+    table = np.array(colorspace.rgb_to_hex(_lookup_table(colors, size) / 255))
+    table.flags.writeable = False
+    return table
+
+
+def plotly_colorscale(colors: Sequence[str], stops: int = PLOTLY_STOPS, size: int = LUT_SIZE) -> tuple[tuple[float, str], ...]:
+    return _plotly_colorscale(tuple(colors), stops, size)
+
+
+@lru_cache(maxsize=None)
+def _plotly_colorscale(colors: tuple[str, ...], stops: int, size: int) -> tuple[tuple[float, str], ...]:
+    # Plotly interpolates linearly in RGB between stops, so sample the perceptual table densely enough.
+    table = _hex_lookup_table(colors, size)
+    indices = np.rint(np.linspace(0, size - 1, stops)).astype(int)
+    return tuple((float(position), str(table[index])) for position, index in zip(np.linspace(0, 1, stops), indices))
+
+
+def named_colorscales(stops: int = PLOTLY_STOPS) -> dict[str, tuple[tuple[float, str], ...]]:
+    # A sequential plotly colorscale per ColorDiscrete palette, e.g. for `color_continuous_scale`.
+    return {name: plotly_colorscale(sequential_colors(colors), stops) for name, colors in charting.discrete_palettes().items()}
+
+
+def map_values(
+    values,
+    colors: Sequence[str],
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+    size: int = LUT_SIZE,
+    as_hex: bool = False,
+    nan_color: str = NAN_COLOR,
+) -> np.ndarray:
+    # Maps an array of any shape to colors with a single table lookup. The range defaults to the finite
+    # values, +/-inf clip to the ends of the scale and NaN is drawn in nan_color.
+    colors = tuple(colors)
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    if vmin is None:
+        vmin = finite.min() if finite.size else 0.0
+    if vmax is None:
+        vmax = finite.max() if finite.size else 0.0
+    scale = (size - 1) / (vmax - vmin) if vmax > vmin else 0.0
+    missing = np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        indices = np.clip(np.where(missing, 0, values - vmin) * scale, 0, size - 1)
+    indices = np.nan_to_num(np.rint(indices), nan=0.0).astype(np.intp)
+
+    table = _hex_lookup_table(colors, size) if as_hex else _lookup_table(colors, size)
+    mapped = table[indices]
+    if missing.any():
+        mapped[missing] = nan_color if as_hex else np.rint(colorspace.hex_to_rgb([nan_color])[0] * 255).astype(np.uint8)
+    return mapped
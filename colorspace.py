@@ -0,0 +1,131 @@
+from typing import Sequence
+
+import numpy as np
+
+
+#---
+# sRGB <-> linear RGB
+#---
+def hex_to_rgb(colors: Sequence[str]) -> np.ndarray:
+    # Returns an array of shape (len(colors), 3) with sRGB channels in [0, 1].
+    values = np.array([int(color[1:7], 16) for color in colors], dtype=np.int64)
+    channels = np.stack([(values >> 16) & 0xFF, (values >> 8) & 0xFF, values & 0xFF], axis=-1)
+    return channels.astype(np.float64) / 255
+
+
+def rgb_to_hex(rgb: np.ndarray) -> list[str]:
+    channels = np.rint(np.clip(rgb, 0, 1) * 255).astype(np.int64).reshape(-1, 3)
+    return ["#{:02x}{:02x}{:02x}".format(r, g, b) for r, g, b in channels]
+
+
+def srgb_to_linear(rgb: np.ndarray) -> np.ndarray:
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(linear: np.ndarray) -> np.ndarray:
+    linear = np.clip(linear, 0, 1)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+
+#---
+# WCAG contrast
+#---
+LUMINANCE_WEIGHTS = np.array([0.2126, 0.7152, 0.0722])
+
+
+def relative_luminance(rgb: np.ndarray) -> np.ndarray:
+    return srgb_to_linear(rgb) @ LUMINANCE_WEIGHTS
+
+
+def luminance_contrast(lum_a: np.ndarray, lum_b: np.ndarray) -> np.ndarray:
+    return (np.maximum(lum_a, lum_b) + 0.05) / (np.minimum(lum_a, lum_b) + 0.05)
+
+
+def contrast_ratio(rgb_a: np.ndarray, rgb_b: np.ndarray) -> np.ndarray:
+    # Same formula as wcag_contrast_ratio.rgb, broadcast over the leading axes.
+    return luminance_contrast(relative_luminance(rgb_a), relative_luminance(rgb_b))
+
+
+#---
+# OKLab, see https://bottosson.github.io/posts/oklab/
+#---
+_LINEAR_TO_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+_LMS_TO_OKLAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+_OKLAB_TO_LMS = np.linalg.inv(_LMS_TO_OKLAB)
+_LMS_TO_LINEAR = np.linalg.inv(_LINEAR_TO_LMS)
+
+
+def linear_to_oklab(linear: np.ndarray) -> np.ndarray:
+    lms = np.cbrt(linear @ _LINEAR_TO_LMS.T)
+    return lms @ _LMS_TO_OKLAB.T
+
+
+def oklab_to_linear(lab: np.ndarray) -> np.ndarray:
+    lms = (lab @ _OKLAB_TO_LMS.T) ** 3
+    return lms @ _LMS_TO_LINEAR.T
+
+
+def gamut_map(lab: np.ndarray, iterations: int = 24) -> np.ndarray:
+    # Brings OKLab colors into the sRGB gamut by scaling chroma down at fixed lightness and hue,
+    # instead of clipping RGB channels, which shifts hue. Bisects the largest in-gamut scale.
+    low = np.zeros(lab.shape[:-1])
+    high = np.ones(lab.shape[:-1])
+    for _ in range(iterations):
+        scale = (low + high) / 2
+        linear = oklab_to_linear(np.concatenate([lab[..., :1], lab[..., 1:] * scale[..., None]], axis=-1))
+        inside = ((linear >= -1e-7) & (linear <= 1 + 1e-7)).all(axis=-1)
+        low = np.where(inside, scale, low)
+        high = np.where(inside, high, scale)
+    linear = oklab_to_linear(lab)
+    already_inside = ((linear >= -1e-7) & (linear <= 1 + 1e-7)).all(axis=-1)
+    scale = np.where(already_inside, 1.0, low)
+    return np.concatenate([lab[..., :1], lab[..., 1:] * scale[..., None]], axis=-1)
+
+
+def rgb_to_oklab(rgb: np.ndarray) -> np.ndarray:
+    return linear_to_oklab(srgb_to_linear(rgb))
+
+
+def oklab_to_rgb(lab: np.ndarray) -> np.ndarray:
+    return linear_to_srgb(oklab_to_linear(lab))
+
+
+#---
+# Color vision deficiency
+#---
+# Machado, Oliveira & Fernandes (2009), severity 1.0, applied to linear RGB.
+CVD_MATRICES = {
+    'normal': np.eye(3),
+    'protan': np.array([
+        [0.152286, 1.052583, -0.204868],
+        [0.114503, 0.786281, 0.099216],
+        [-0.003882, -0.048116, 1.051998],
+    ]),
+    'deutan': np.array([
+        [0.367322, 0.860646, -0.227968],
+        [0.280085, 0.672501, 0.047413],
+        [-0.011820, 0.042940, 0.968881],
+    ]),
+    'tritan': np.array([
+        [1.255528, -0.076749, -0.178779],
+        [-0.078411, 0.930809, 0.147602],
+        [0.004733, 0.691367, 0.303900],
+    ]),
+}
+VISIONS = tuple(CVD_MATRICES)
+_CVD_STACK = np.stack([CVD_MATRICES[vision] for vision in VISIONS])
+
+
+def simulate_cvd(rgb: np.ndarray) -> np.ndarray:
+    # Returns linear RGB of shape (len(VISIONS), *rgb.shape), one slice per vision type.
+    linear = srgb_to_linear(rgb)
+    simulated = np.einsum('vij,...j->v...i', _CVD_STACK, linear)
+    return np.clip(simulated, 0, 1)
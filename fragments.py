@@ -30,3 +30,22 @@ def sample_components(key: str):
     st.checkbox("Checkbox", key=f"{key}:checkbox", value=True)
     st.radio("Radio", options=["Option 1", "Option 2"], key=f"{key}:radio")
     st.selectbox("Selectbox", options=["Option 1", "Option 2"], key=f"{key}:selectbox")
+
+
+def palette_audit_summary(palette: str, background_rgb_hex: str, adapted: bool = False) -> None:
+    import accessibility
+
+    if adapted:
+        audit = accessibility.audit_adapted_palette(palette, background_rgb_hex)
+    else:
+        audit = accessibility.audit_palette(palette, background_rgb_hex)
+    if not audit.pair_failures and not audit.contrast_failures:
+        st.markdown(":white_check_mark: All colors are distinguishable and readable on the background")
+        return
+
+    if audit.contrast_failures:
+        st.markdown(f":x: {len(audit.contrast_failures)} color(s) below {accessibility.MIN_CONTRAST:.0f}:1 against the background")
+        st.dataframe([failure._asdict() for failure in audit.contrast_failures], use_container_width=True)
+    if audit.pair_failures:
+        st.markdown(f":x: {len(audit.pair_failures)} color pair(s) hard to tell apart")
+        st.dataframe([failure._asdict() for failure in audit.pair_failures], use_container_width=True)
@@ -0,0 +1,248 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+import colorspace
+from util import ThemeColor
+
+FIELDS = ThemeColor._fields
+_INDEX = {field: i for i, field in enumerate(FIELDS)}
+
+# Accepted contrast band for every pair of theme colors. Foregrounds must clear WCAG AAA
+# on both backgrounds, and the two backgrounds should be told apart without competing.
+# Primary (links, accents) must stay separable from body text; 3:1 is out of reach once
+# both clear 7:1 on the same backgrounds, so 2:1 is asked instead. Override with `pair_bands`.
+PAIR_BANDS: dict[tuple[str, str], tuple[float, float]] = {
+    ("primaryColor", "backgroundColor"): (7.0, np.inf),
+    ("primaryColor", "secondaryBackgroundColor"): (7.0, np.inf),
+    ("textColor", "backgroundColor"): (7.0, np.inf),
+    ("textColor", "secondaryBackgroundColor"): (7.0, np.inf),
+    ("backgroundColor", "secondaryBackgroundColor"): (1.05, 1.5),
+    ("primaryColor", "textColor"): (2.0, np.inf),
+}
+
+POPULATION = 64
+SIGMA = 0.15
+MIN_SIGMA = 0.01
+# Islands that start late still run this many generations so they return a usable front.
+MIN_GENERATIONS = 10
+# Islands per search, so concurrent searches on a shared pool split its workers instead of queuing.
+MAX_ISLANDS = 4
+
+
+class Candidate(NamedTuple):
+    theme: ThemeColor
+    violation: float
+    brand_distance: float
+    contrasts: dict[tuple[str, str], float]
+
+
+class _Problem(NamedTuple):
+    pairs: np.ndarray   # (pair, 2) color indices
+    bands: np.ndarray   # (pair, 2) min/max contrast
+    brand: np.ndarray   # (4, 3) OKLab, zeros where nothing is pinned
+    pinned: np.ndarray  # (4,) bool
+    seed_rgb: np.ndarray  # (4, 3) starting point, brand colors where pinned
+
+
+def _problem(brand: dict[str, str], pair_bands: dict[tuple[str, str], tuple[float, float]]) -> _Problem:
+    pinned = np.array([field in brand for field in FIELDS])
+    seed_rgb = np.full((len(FIELDS), 3), 0.5)
+    if brand:
+        seed_rgb[pinned] = colorspace.hex_to_rgb([brand[field] for field in FIELDS if field in brand])
+    return _Problem(
+        pairs=np.array([(_INDEX[a], _INDEX[b]) for a, b in pair_bands]),
+        bands=np.array(list(pair_bands.values()), dtype=np.float64),
+        brand=np.where(pinned[:, None], colorspace.rgb_to_oklab(seed_rgb), 0.0),
+        pinned=pinned,
+        seed_rgb=seed_rgb,
+    )
+
+
+def _contrasts(problem: _Problem, rgb: np.ndarray) -> np.ndarray:
+    # (population, 4, 3) sRGB -> (population, pair) contrast ratios.
+    luminance = colorspace.relative_luminance(rgb)
+    return colorspace.luminance_contrast(luminance[:, problem.pairs[:, 0]], luminance[:, problem.pairs[:, 1]])
+
+
+def _objectives(problem: _Problem, rgb: np.ndarray) -> np.ndarray:
+    # (population, 2): relative distance outside the contrast bands, mean OKLab distance to the brand colors.
+    contrast = _contrasts(problem, rgb)
+    below = np.maximum(problem.bands[:, 0] - contrast, 0) / problem.bands[:, 0]
+    above = np.maximum(contrast - problem.bands[:, 1], 0) / problem.bands[:, 1]
+    violation = (below + above).sum(axis=1)
+
+    if problem.pinned.any():
+        distance = np.linalg.norm(colorspace.rgb_to_oklab(rgb) - problem.brand, axis=-1)
+        brand_distance = distance[:, problem.pinned].mean(axis=1)
+    else:
+        brand_distance = np.zeros(len(rgb))
+    return np.stack([violation, brand_distance], axis=1)
+
+
+def _dominates(objectives: np.ndarray) -> np.ndarray:
+    # [i, j] is True when candidate i Pareto-dominates candidate j (all objectives minimized).
+    le = (objectives[:, None, :] <= objectives[None, :, :]).all(axis=-1)
+    lt = (objectives[:, None, :] < objectives[None, :, :]).any(axis=-1)
+    return le & lt
+
+
+def _pareto_ranks(objectives: np.ndarray) -> np.ndarray:
+    dominates = _dominates(objectives)
+    ranks = np.full(len(objectives), -1)
+    remaining = np.ones(len(objectives), dtype=bool)
+    rank = 0
+    while remaining.any():
+        front = remaining & ~(dominates & remaining[:, None]).any(axis=0)
+        ranks[front] = rank
+        remaining &= ~front
+        rank += 1
+    return ranks
+
+
+def _crowding(objectives: np.ndarray) -> np.ndarray:
+    order = np.argsort(objectives, axis=0)
+    spread = np.ptp(objectives, axis=0)
+    spread[spread == 0] = 1
+    sorted_objectives = np.take_along_axis(objectives, order, axis=0)
+    gaps = np.zeros_like(objectives)
+    gaps[1:-1] = (sorted_objectives[2:] - sorted_objectives[:-2]) / spread
+    gaps[[0, -1]] = np.inf
+    distance = np.zeros_like(objectives)
+    np.put_along_axis(distance, order, gaps, axis=0)
+    return distance.sum(axis=1)
+
+
+def _select(objectives: np.ndarray, size: int) -> np.ndarray:
+    # NSGA-II survivor selection: lower Pareto rank first, wider crowding distance within a rank.
+    ranks = _pareto_ranks(objectives)
+    crowding = np.zeros(len(objectives))
+    for rank in np.unique(ranks):
+        front = ranks == rank
+        crowding[front] = _crowding(objectives[front])
+    return np.lexsort((-crowding, ranks))[:size]
+
+
+def evolve(brand: dict[str, str], pair_bands: dict[tuple[str, str], tuple[float, float]], deadline: float, seed: int, population: int = POPULATION) -> tuple[np.ndarray, np.ndarray]:
+    """Runs one island until `deadline`, a `time.monotonic()` value, and returns its Pareto set as
+    (rgb, objectives). An island that starts late still runs `MIN_GENERATIONS` generations.
+    """
+    rng = np.random.default_rng(seed)
+    problem = _problem(brand, pair_bands)
+
+    # Half the population starts around the brand colors, the rest anywhere in the RGB cube.
+    rgb = rng.random((population, len(FIELDS), 3))
+    rgb[: population // 2, problem.pinned] = problem.seed_rgb[problem.pinned]
+    objectives = _objectives(problem, rgb)
+
+    sigma = SIGMA
+    generation = 0
+    while generation < MIN_GENERATIONS or time.monotonic() < deadline:
+        generation += 1
+        parents = rgb[rng.integers(0, population, population)]
+        # Each child mutates a random subset of its four colors.
+        mutate = rng.random((population, len(FIELDS), 1)) < 0.5
+        children = np.clip(parents + mutate * rng.normal(0, sigma, parents.shape), 0, 1)
+
+        rgb = np.concatenate([rgb, children])
+        objectives = np.concatenate([objectives, _objectives(problem, children)])
+        survivors = _select(objectives, population)
+        rgb, objectives = rgb[survivors], objectives[survivors]
+        sigma = max(sigma * 0.995, MIN_SIGMA)
+
+    front = _pareto_ranks(objectives) == 0
+    return rgb[front], objectives[front]
+
+
+def new_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    # forkserver rather than fork: forking a multi-threaded Streamlit server can deadlock the child.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, mp_context=multiprocessing.get_context(method))
+
+
+def optimize_theme(
+    brand: Optional[dict[str, str]] = None,
+    time_budget: float = 3.0,
+    islands: Optional[int] = None,
+    pair_bands: Optional[dict[tuple[str, str], tuple[float, float]]] = None,
+    executor: Optional[Executor] = None,
+    seed: Optional[int] = None,
+) -> list[Candidate]:
+    """Searches the four-color theme space for the best trade-offs between
+    contrast compliance and closeness to the brand colors.
+
+    Independent evolutionary islands (one per CPU, at most `MAX_ISLANDS`, by default)
+    run on `executor`, a new process pool by default, until `time_budget` seconds after
+    the call, and their Pareto sets are merged. Islands still queued behind other
+    searches at the deadline are cancelled; if none ran, one runs in this thread.
+    Candidates are sorted by violation, so compliant themes come first; use `spread`
+    to pick a few along the trade-off.
+    """
+    # CLOCK_MONOTONIC is system-wide, so worker processes on this machine share the deadline.
+    deadline = time.monotonic() + time_budget
+    brand = brand or {}
+    pair_bands = pair_bands or PAIR_BANDS
+    islands = islands or min(os.cpu_count() or 1, MAX_ISLANDS)
+    seeds = np.random.SeedSequence(seed).generate_state(islands)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = new_pool(islands)
+    try:
+        futures = [executor.submit(evolve, brand, pair_bands, deadline, int(island_seed)) for island_seed in seeds]
+        wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        results = [future.result() for future in futures if not future.cancel()]
+    finally:
+        if own_executor:
+            executor.shutdown()
+    if not results:
+        results = [evolve(brand, pair_bands, deadline, int(seeds[0]))]
+
+    # Score what will actually be shown: 8-bit hex colors.
+    rgb = np.rint(np.concatenate([island_rgb for island_rgb, _ in results]) * 255) / 255
+    problem = _problem(brand, pair_bands)
+    objectives = _objectives(problem, rgb)
+    front = ~_dominates(objectives).any(axis=0)
+    rgb, objectives = rgb[front], objectives[front]
+    contrasts = _contrasts(problem, rgb)
+
+    candidates = {}
+    for i in np.lexsort((objectives[:, 1], objectives[:, 0])):
+        theme = ThemeColor(*colorspace.rgb_to_hex(rgb[i]))
+        if theme in candidates:
+            continue
+        candidates[theme] = Candidate(
+            theme=theme,
+            violation=float(objectives[i, 0]),
+            brand_distance=float(objectives[i, 1]),
+            contrasts={pair: float(value) for pair, value in zip(pair_bands, contrasts[i])},
+        )
+    return list(candidates.values())
+
+
+def spread(candidates: list[Candidate], count: int) -> list[Candidate]:
+    """Picks `count` candidates spread along the Pareto front instead of the first few near-duplicates.
+
+    Starts from the least violating candidate and repeatedly adds the one farthest from those already
+    picked, in normalized objective space, or in OKLab color space when the objectives don't vary.
+    """
+    if len(candidates) <= count:
+        return list(candidates)
+    objectives = np.array([(candidate.violation, candidate.brand_distance) for candidate in candidates])
+    ranges = np.ptp(objectives, axis=0)
+    if (ranges > 0).any():
+        features = objectives[:, ranges > 0] / ranges[ranges > 0]
+    else:
+        features = colorspace.rgb_to_oklab(np.stack([colorspace.hex_to_rgb(candidate.theme) for candidate in candidates]))
+        features = features.reshape(len(candidates), -1)
+
+    picked = [0]
+    distance = np.linalg.norm(features - features[0], axis=1)
+    while len(picked) < count:
+        picked.append(int(distance.argmax()))
+        distance = np.minimum(distance, np.linalg.norm(features - features[picked[-1]], axis=1))
+    return [candidates[i] for i in sorted(picked)]
@@ -0,0 +1,71 @@
+import logging
+import sys
+from collections.abc import Mapping
+from typing import Optional
+
+import streamlit as st
+from streamlit.logger import get_logger
+
+_LOGGER = get_logger(__name__)
+
+
+def deep_sizeof(obj, seen: Optional[set[int]] = None) -> int:
+    # Approximate footprint of obj and everything it holds; objects reachable twice are counted once.
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    memory_usage = getattr(obj, "memory_usage", None)
+    if callable(memory_usage) and type(obj).__module__.startswith("pandas"):
+        usage = memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if type(obj).__module__ == "numpy" and hasattr(obj, "nbytes"):
+        return max(sys.getsizeof(obj), int(obj.nbytes))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, Mapping):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in list(obj.items()))
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in list(obj))
+    return size
+
+
+def session_state_bytes(state: Optional[Mapping] = None) -> dict[str, int]:
+    # Bytes per key of the given session state, the current session's by default.
+    state = st.session_state.to_dict() if state is None else state
+    return {key: deep_sizeof(value) for key, value in list(state.items())}
+
+
+def server_session_state_stats() -> tuple[int, str, int]:
+    # Session state of every active session in this server process, as (total, unit, sessions).
+    # Read from the stats Streamlit serves at /_stcore/metrics: the total is in bytes with
+    # server.enableExpensiveMemoryStats on, otherwise it is the number of session-state keys.
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.stats import ACTIVE_SESSIONS_FAMILY, CACHE_MEMORY_FAMILY
+
+    if not Runtime.exists():
+        return 0, "bytes", 0
+    stats = Runtime.instance().stats_mgr.get_stats(family_names=[CACHE_MEMORY_FAMILY, ACTIVE_SESSIONS_FAMILY])
+    total = sum(stat.byte_length for stat in stats.get(CACHE_MEMORY_FAMILY, []) if stat.category_name == "st_session_state")
+    sessions = sum(stat.value for stat in stats.get(ACTIVE_SESSIONS_FAMILY, []))
+    unit = "bytes" if config.get_option("server.enableExpensiveMemoryStats") else "keys"
+    return total, unit, sessions
+
+
+def log_session_state_bytes() -> None:
+    # Instrumentation hook, enabled with `streamlit run app.py --logger.level=debug`.
+    if not _LOGGER.isEnabledFor(logging.DEBUG):
+        return
+    session = session_state_bytes()
+    total, unit, sessions = server_session_state_stats()
+    _LOGGER.debug(
+        "session state: %d bytes in this session (%s), %d %s across %d active sessions",
+        sum(session.values()),
+        ", ".join(f"{key}={size}" for key, size in sorted(session.items(), key=lambda item: item[1], reverse=True)),
+        total,
+        unit,
+        sessions,
+    )
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import accessibility
+import charting
+import colorspace
+
+BACKGROUNDS = ["#ffffff", "#808080", "#0e1117", "#f0f2f6"]
+
+
+def _hue(lab: np.ndarray) -> np.ndarray:
+    return np.arctan2(lab[:, 2], lab[:, 1])
+
+
+def test_audit_reports_each_low_contrast_color_once():
+    audit = accessibility.audit_palette("ilo", "#ffffff")
+    colors = [failure.color for failure in audit.contrast_failures]
+    assert "#F0F0F0" in colors
+    assert len(colors) == len(set(colors))
+
+
+@pytest.mark.parametrize("background", BACKGROUNDS)
+@pytest.mark.parametrize("palette", ["gecko7", "google", "ilo", "tableau"])
+def test_adapt_palette_reaches_the_target_and_keeps_hue(palette, background):
+    colors = charting.discrete_palettes()[palette]
+    adapted = accessibility.adapt_palette(palette, background)
+    contrast = colorspace.contrast_ratio(colorspace.hex_to_rgb([background])[0], colorspace.hex_to_rgb(adapted))
+    assert (contrast >= accessibility.MIN_CONTRAST).all()
+
+    lab = colorspace.rgb_to_oklab(colorspace.hex_to_rgb(colors))
+    adapted_lab = colorspace.rgb_to_oklab(colorspace.hex_to_rgb(adapted))
+    chromatic = np.hypot(lab[:, 1], lab[:, 2]) >= accessibility.MIN_CHROMA
+    # Chromatic colors stay chromatic, at the same OKLab hue.
+    assert (np.hypot(adapted_lab[chromatic, 1], adapted_lab[chromatic, 2]) >= accessibility.MIN_CHROMA).all()
+    hue_error = np.angle(np.exp(1j * (_hue(adapted_lab[chromatic]) - _hue(lab[chromatic]))))
+    assert np.abs(hue_error).max(initial=0) < 0.05
+
+
+def test_adapt_palette_moves_failing_colors_by_the_minimum():
+    assert accessibility.adapt_palette("gecko7", "#ffffff", min_distance=0) == [
+        "#004457", "#567583", "#88979e", "#949494", "#709d99", "#33a49b", "#00a59b",
+    ]
+    # Colors that already pass are untouched, and the distinctness rule never moves to near-black.
+    assert accessibility.adapt_palette("google", "#808080")[-1] == "#ffd9ce"
+
+
+def test_audit_adapted_palette_checks_the_adapted_colors():
+    def normal_vision(audit):
+        return [failure.color for failure in audit.contrast_failures if failure.vision == "normal"]
+
+    assert normal_vision(accessibility.audit_palette("ilo", "#ffffff")) == ["#F47D30", "#F0F0F0"]
+    assert normal_vision(accessibility.audit_adapted_palette("ilo", "#ffffff")) == []
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import session_memory
+
+APP_PATH = Path(__file__).resolve().parent / "app.py"
+# A fresh session on the editor before the state was consolidated: four hex pickers, four
+# synced pickers, twelve H/L/S ints and the preset index.
+BASELINE_STATE_BYTES = 812
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # app.py resolves resources relative to the working directory.
+    monkeypatch.chdir(APP_PATH.parent)
+    return AppTest.from_file(str(APP_PATH), default_timeout=60).run()
+
+
+def _lightness_slider(at: AppTest, label: str):
+    return next(slider for slider in at.slider if slider.label == f"L for {label}")
+
+
+def test_lightness_round_trip_through_black_and_white_keeps_hue(app):
+    assert app.session_state.primaryColor == "#ff4b4b"
+    for lightness in (0, 100, 50):
+        app = _lightness_slider(app, "Primary color").set_value(lightness).run()
+    assert not app.exception
+    assert app.session_state.primaryColor == "#ff0000"
+    assert app.session_state.primaryColor2 == "#ff0000"
+    # Once the hex carries its own hue and saturation again, they are no longer stored.
+    assert "primaryColorH" not in app.session_state
+    assert "primaryColorS" not in app.session_state
+
+
+def test_session_state_is_smaller_than_before(app):
+    state = app.session_state.to_dict()
+    fields = ["primaryColor", "backgroundColor", "secondaryBackgroundColor", "textColor"]
+    assert set(state) == {"preset_color", *fields, *(f"{key}2" for key in fields), *(f"{key}L" for key in fields)}
+    assert sum(session_memory.session_state_bytes(state).values()) < BASELINE_STATE_BYTES
+
+
+def test_preset_sets_every_picker(app):
+    app = next(box for box in app.selectbox if box.label == "Preset colors").set_value(1).run()
+    assert not app.exception
+    assert app.session_state.backgroundColor == app.session_state.backgroundColor2 == "#0e1117"
+    assert app.session_state.backgroundColorL == 7
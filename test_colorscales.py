@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import charting
+import colorscales
+
+
+def test_map_values_ignores_inf_for_the_range_and_marks_nan():
+    colors = ("#000000", "#ffffff")
+    mapped = colorscales.map_values([0, 1, np.nan, np.inf, -np.inf], colors, as_hex=True, nan_color="#ff0000")
+    assert list(mapped) == ["#000000", "#ffffff", "#ff0000", "#ffffff", "#000000"]
+    rgb = colorscales.map_values([[0, np.nan]], colors, nan_color="#ff0000")
+    assert rgb.tolist() == [[[0, 0, 0], [255, 0, 0]]]
+
+
+def test_lookup_table_spans_the_palette_and_is_read_only():
+    table = colorscales.lookup_table(["#004457", "#05f1e3"], size=1024)
+    assert table.shape == (1024, 3) and table.dtype == np.uint8
+    assert table[0].tolist() == [0x00, 0x44, 0x57]
+    assert table[-1].tolist() == [0x05, 0xF1, 0xE3]
+    with pytest.raises(ValueError):
+        table[0] = 0
+
+
+def test_public_functions_accept_palette_lists():
+    palette = charting.ColorDiscrete.gecko5
+    assert colorscales.map_values([0, 1], palette, as_hex=True).tolist() == ["#004457", "#05f1e3"]
+    assert colorscales.lookup_table(palette) is colorscales.lookup_table(tuple(palette))
+    assert not colorscales.is_sequential(palette)
+
+
+def test_is_sequential():
+    assert colorscales.is_sequential(charting.ColorDiscrete.gecko3)
+    assert colorscales.is_sequential(["#ffffff", "#808080", "#000000"])
+    assert not colorscales.is_sequential(charting.ColorDiscrete.ilo)
+    assert not colorscales.is_sequential(["#808080"])
+
+
+def test_plotly_colorscale_stops():
+    scale = colorscales.plotly_colorscale(["#000000", "#ffffff"], stops=5)
+    assert [position for position, _ in scale] == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert scale[0][1] == "#000000" and scale[-1][1] == "#ffffff"
+
+
+def test_every_palette_has_a_sequential_scale():
+    scales = colorscales.named_colorscales()
+    assert set(scales) == set(charting.discrete_palettes())
+    for name, colors in charting.discrete_palettes().items():
+        assert len(colors) < 2 or colorscales.is_sequential(colorscales.sequential_colors(colors)), name
+
+
+def test_registered_templates_use_the_palette_scale():
+    import plotly.io as pio
+
+    charting.initialize_plotly_themes()
+    expected = colorscales.named_colorscales()["gecko7"]
+    assert [list(stop) for stop in pio.templates["gecko7"].layout.colorscale.sequential] == [list(stop) for stop in expected]
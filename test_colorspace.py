@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+import wcag_contrast_ratio as contrast
+
+import colorspace
+
+COLORS = ["#ff4b4b", "#ffffff", "#f0f2f6", "#31333F", "#0e1117", "#262730", "#fafafa", "#000000", "#05f1e3", "#4E79A7"]
+
+
+@pytest.mark.parametrize("foreground", COLORS)
+def test_contrast_ratio_matches_wcag_contrast_ratio(foreground):
+    rgb = colorspace.hex_to_rgb(COLORS)
+    expected = [contrast.rgb(tuple(colorspace.hex_to_rgb([foreground])[0]), tuple(background)) for background in rgb]
+    np.testing.assert_allclose(colorspace.contrast_ratio(colorspace.hex_to_rgb([foreground])[0], rgb), expected)
+
+
+def test_hex_round_trip():
+    assert colorspace.rgb_to_hex(colorspace.hex_to_rgb(COLORS)) == [color.lower() for color in COLORS]
+
+
+def test_oklab_round_trip():
+    rgb = np.random.default_rng(0).random((1000, 3))
+    np.testing.assert_allclose(colorspace.oklab_to_rgb(colorspace.rgb_to_oklab(rgb)), rgb, atol=1e-6)
+
+
+def test_oklab_reference_values():
+    # White is L=1 with no chroma, black is the origin.
+    np.testing.assert_allclose(colorspace.rgb_to_oklab(np.array([[1.0, 1.0, 1.0], [0.0, 0.0, 0.0]])), [[1, 0, 0], [0, 0, 0]], atol=1e-4)
+
+
+def test_cvd_matrices_preserve_greys():
+    for vision in colorspace.VISIONS:
+        np.testing.assert_allclose(colorspace.CVD_MATRICES[vision].sum(axis=1), 1, atol=1e-3)
+    greys = np.linspace(0, 1, 11)[:, None].repeat(3, axis=1)
+    simulated = colorspace.simulate_cvd(greys)
+    np.testing.assert_allclose(simulated, np.broadcast_to(colorspace.srgb_to_linear(greys), simulated.shape), atol=1e-3)
+
+
+def test_gamut_map_keeps_lightness_and_hue():
+    lab = colorspace.rgb_to_oklab(colorspace.hex_to_rgb(["#F47D30", "#F44336", "#05f1e3"]))
+    lab[:, 0] = 0.3
+    mapped = colorspace.gamut_map(lab)
+    linear = colorspace.oklab_to_linear(mapped)
+    assert ((linear > -1e-6) & (linear < 1 + 1e-6)).all()
+    np.testing.assert_allclose(mapped[:, 0], lab[:, 0])
+    np.testing.assert_allclose(np.arctan2(mapped[:, 2], mapped[:, 1]), np.arctan2(lab[:, 2], lab[:, 1]))
@@ -0,0 +1,75 @@
+import time
+from concurrent.futures import Executor, Future
+
+import numpy as np
+
+import optimizer
+from util import ThemeColor
+
+
+class InlineExecutor(Executor):
+    # Runs each island in the calling thread, one after another.
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class StalledExecutor(Executor):
+    # A pool busy with other searches: nothing submitted ever starts.
+    def submit(self, fn, /, *args, **kwargs):
+        return Future()
+
+
+def _candidate(violation: float, brand_distance: float, color: str = "#000000") -> optimizer.Candidate:
+    return optimizer.Candidate(ThemeColor(color, "#ffffff", "#f0f2f6", "#31333f"), violation, brand_distance, {})
+
+
+def test_dominates():
+    objectives = np.array([[0, 0], [1, 1], [0, 1], [0, 0]])
+    dominates = optimizer._dominates(objectives)
+    assert dominates[0].tolist() == [False, True, True, False]
+    assert dominates[2].tolist() == [False, True, False, False]
+    # Equal candidates don't dominate each other.
+    assert not dominates[0, 3] and not dominates[3, 0]
+
+
+def test_pareto_ranks():
+    objectives = np.array([[0, 1], [1, 0], [1, 1], [2, 2], [0.5, 0.5]])
+    assert optimizer._pareto_ranks(objectives).tolist() == [0, 0, 1, 2, 0]
+
+
+def test_crowding_keeps_the_ends_and_scores_gaps():
+    objectives = np.array([[1, 2], [0, 3], [3, 0], [2, 1]], dtype=float)
+    crowding = optimizer._crowding(objectives)
+    assert np.isinf(crowding[[1, 2]]).all()
+    np.testing.assert_allclose(crowding[[0, 3]], [4 / 3, 4 / 3])
+
+
+def test_spread_picks_the_ends_and_the_middle():
+    candidates = [_candidate(violation, 1 - violation) for violation in np.linspace(0, 1, 11)]
+    picked = optimizer.spread(candidates, 3)
+    assert [candidate.violation for candidate in picked] == [0.0, 0.5, 1.0]
+    assert optimizer.spread(candidates[:2], 3) == candidates[:2]
+
+
+def test_spread_falls_back_to_colors_when_objectives_tie():
+    candidates = [_candidate(0, 0, color) for color in ["#000000", "#010101", "#ffffff", "#fefefe"]]
+    picked = {candidate.theme.primaryColor for candidate in optimizer.spread(candidates, 2)}
+    assert picked == {"#000000", "#ffffff"}
+
+
+def test_optimize_theme_returns_a_sorted_unique_front():
+    brand = {"primaryColor": "#ff4b4b"}
+    candidates = optimizer.optimize_theme(brand, time_budget=0.3, islands=2, executor=InlineExecutor(), seed=0)
+    violations = [candidate.violation for candidate in candidates]
+    assert candidates and violations == sorted(violations)
+    assert len({candidate.theme for candidate in candidates}) == len(candidates)
+    assert set(candidates[0].contrasts) == set(optimizer.PAIR_BANDS)
+
+
+def test_optimize_theme_keeps_its_deadline_on_a_busy_pool():
+    start = time.monotonic()
+    candidates = optimizer.optimize_theme(time_budget=0.3, islands=2, executor=StalledExecutor(), seed=0)
+    assert candidates
+    assert time.monotonic() - start < 1.0